@@ -116,13 +116,13 @@ class ClaudeAnalyzer:
         """构建 Claude 提示词"""
         # 构建分类说明
         category_desc = "\n".join([
-            f"- {cat['icon']} {cat['name']}: {cat['description']}"
+            f"- {cat.icon} {cat.name}: {cat.description}"
             for cat in CATEGORIES.values()
         ])
 
         # 构建主题说明
         theme_desc = "\n".join([
-            f"- {key}: {theme['name']} - {theme['description']}"
+            f"- {key}: {theme.name} - {theme.description}"
             for key, theme in THEMES.items()
         ])
 
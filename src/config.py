@@ -2,53 +2,162 @@
 配置模块 - 包含所有配置信息和主题定义
 """
 import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
 
 # ============================================================================
-# API 配置
+# 运行时配置（导入时从环境变量一次性读取）
 # ============================================================================
-ANTHROPIC_BASE_URL = os.getenv(
-    "ANTHROPIC_BASE_URL",
-    "https://open.bigmodel.cn/api/anthropic"
+@dataclass(frozen=True, slots=True)
+class Config:
+    """运行时配置，导入时构建一次，之后只读"""
+    anthropic_base_url: str
+    zhipu_api_key: Optional[str]
+    claude_model: str
+    rss_url: str
+    output_dir: str
+    github_pages_url: str
+    smtp_host: Optional[str]
+    smtp_port: int
+    smtp_user: Optional[str]
+    smtp_password: Optional[str]
+    notification_to: Optional[str]
+    firefly_api_url: str
+    firefly_api_key: str
+    enable_image_generation: bool
+    enable_image_cache: bool
+    image_cache_dir: str
+    xhs_font_dir: str
+    dingtalk_webhook_url: Optional[str]
+    dingtalk_secret: Optional[str]
+    enable_dingtalk: bool
+    github_repository: Optional[str]
+    github_run_id: Optional[str]
+    github_server_url: str
+
+
+def _get_env_int(key: str, default: int) -> int:
+    """获取整数环境变量，处理空字符串情况"""
+    value = os.getenv(key)
+    if value is None or value == "":
+        return default
+    return int(value)
+
+
+def _get_env_bool(key: str, default: str = "false") -> bool:
+    """获取布尔环境变量（仅 "true" 视为开启）"""
+    return os.getenv(key, default).lower() == "true"
+
+
+# 整数类型环境变量及其默认值
+_INT_ENV_DEFAULTS = (
+    ("SMTP_PORT", 587),
 )
-ZHIPU_API_KEY = os.getenv("ZHIPU_API_KEY")
+
+
+def _load_config() -> Config:
+    """读取环境变量并构建配置对象"""
+    ints = {key: _get_env_int(key, default) for key, default in _INT_ENV_DEFAULTS}
+    return Config(
+        anthropic_base_url=os.getenv(
+            "ANTHROPIC_BASE_URL",
+            "https://open.bigmodel.cn/api/anthropic"
+        ),
+        zhipu_api_key=os.getenv("ZHIPU_API_KEY"),
+        claude_model=os.getenv("CLAUDE_MODEL", "glm-4.7"),  # 智谱最新旗舰模型
+        rss_url=os.getenv("RSS_URL", "https://news.smol.ai/rss.xml"),
+        output_dir=os.getenv("OUTPUT_DIR", "docs"),
+        github_pages_url=os.getenv("GITHUB_PAGES_URL", ""),
+        smtp_host=os.getenv("SMTP_HOST"),
+        smtp_port=ints["SMTP_PORT"],
+        smtp_user=os.getenv("SMTP_USER"),
+        smtp_password=os.getenv("SMTP_PASSWORD"),
+        notification_to=os.getenv("NOTIFICATION_TO"),
+        firefly_api_url=os.getenv("FIREFLY_API_URL", "https://fireflycard-api.302ai.cn/api/saveImg"),
+        firefly_api_key=os.getenv("FIREFLY_API_KEY", ""),  # 如果需要 API Key
+        enable_image_generation=_get_env_bool("ENABLE_IMAGE_GENERATION"),
+        enable_image_cache=_get_env_bool("ENABLE_IMAGE_CACHE", "true"),
+        image_cache_dir=os.getenv("IMAGE_CACHE_DIR", ".cache/images"),
+        xhs_font_dir=os.getenv("XHS_FONT_DIR", ""),  # 本地子集字体目录（可选）
+        dingtalk_webhook_url=os.getenv("DINGTALK_WEBHOOK_URL"),  # Webhook URL
+        dingtalk_secret=os.getenv("DINGTALK_SECRET"),            # 加签密钥
+        enable_dingtalk=_get_env_bool("ENABLE_DINGTALK"),
+        github_repository=os.getenv("GITHUB_REPOSITORY"),
+        github_run_id=os.getenv("GITHUB_RUN_ID"),
+        github_server_url=os.getenv("GITHUB_SERVER_URL", "https://github.com"),
+    )
+
+
+_cfg = _load_config()
+
+# ============================================================================
+# API 配置
+# ============================================================================
+ANTHROPIC_BASE_URL = _cfg.anthropic_base_url
+ZHIPU_API_KEY = _cfg.zhipu_api_key
 
 # Claude 模型配置
-CLAUDE_MODEL = os.getenv("CLAUDE_MODEL", "glm-4.7")  # 智谱最新旗舰模型
+CLAUDE_MODEL = _cfg.claude_model
 CLAUDE_MAX_TOKENS = 8192
 
 # ============================================================================
 # RSS 配置
 # ============================================================================
-RSS_URL = os.getenv("RSS_URL", "https://news.smol.ai/rss.xml")
+RSS_URL = _cfg.rss_url
 RSS_TIMEOUT = 30  # 秒
 
 # ============================================================================
 # 输出配置
 # ============================================================================
-OUTPUT_DIR = os.getenv("OUTPUT_DIR", "docs")
-GITHUB_PAGES_URL = os.getenv("GITHUB_PAGES_URL", "")
+OUTPUT_DIR = _cfg.output_dir
+GITHUB_PAGES_URL = _cfg.github_pages_url
 
 # ============================================================================
 # 邮件通知配置
 # ============================================================================
-def _get_env_int(key: str, default: int) -> int:
-    """获取整数环境变量，处理空字符串情况"""
-    value = os.getenv(key)
-    if value is None or value == "":
-        return default
-    return int(value)
-
+SMTP_HOST = _cfg.smtp_host
+SMTP_PORT = _cfg.smtp_port
+SMTP_USER = _cfg.smtp_user
+SMTP_PASSWORD = _cfg.smtp_password
+NOTIFICATION_TO = _cfg.notification_to
 
-SMTP_HOST = os.getenv("SMTP_HOST")
-SMTP_PORT = _get_env_int("SMTP_PORT", 587)
-SMTP_USER = os.getenv("SMTP_USER")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
-NOTIFICATION_TO = os.getenv("NOTIFICATION_TO")
+# ============================================================================
+# GitHub Actions 环境（用于日志链接）
+# ============================================================================
+GITHUB_REPOSITORY = _cfg.github_repository
+GITHUB_RUN_ID = _cfg.github_run_id
+GITHUB_SERVER_URL = _cfg.github_server_url
 
 # ============================================================================
 # 8种主题配色方案
 # ============================================================================
-THEMES = {
+@dataclass(frozen=True, slots=True)
+class Theme:
+    """主题配色"""
+    name: str
+    description: str
+    glow_start: str
+    glow_end: str
+    title: str
+    text: str
+    accent: str
+    secondary: str
+
+    @property
+    def gradient(self) -> str:
+        """由光晕起止色计算的背景渐变"""
+        return _theme_gradient(self.glow_start, self.glow_end)
+
+
+@lru_cache(maxsize=16)
+def _theme_gradient(glow_start: str, glow_end: str) -> str:
+    """拼接主题背景渐变（结果按颜色缓存）"""
+    return f"linear-gradient(135deg, {glow_start} 0%, {glow_end} 100%)"
+
+
+_RAW_THEMES = {
     "blue": {
         "name": "柔和蓝色",
         "description": "适用于科技/商务/数据类内容",
@@ -57,8 +166,7 @@ THEMES = {
         "title": "#FFFFFF",
         "text": "#E3F2FD",
         "accent": "#42A5F5",
-        "secondary": "#B0BEC5",
-        "gradient": "linear-gradient(135deg, #0A1929 0%, #1A3A52 100%)"
+        "secondary": "#B0BEC5"
     },
     "indigo": {
         "name": "深靛蓝",
@@ -68,8 +176,7 @@ THEMES = {
         "title": "#FFFFFF",
         "text": "#E3F2FD",
         "accent": "#5C9FE5",
-        "secondary": "#BBDEFB",
-        "gradient": "linear-gradient(135deg, #0F1C3F 0%, #1A2F5A 100%)"
+        "secondary": "#BBDEFB"
     },
     "purple": {
         "name": "优雅紫色",
@@ -79,8 +186,7 @@ THEMES = {
         "title": "#FFFFFF",
         "text": "#F3E5F5",
         "accent": "#B39DDB",
-        "secondary": "#D1C4E9",
-        "gradient": "linear-gradient(135deg, #1A0A28 0%, #2D1B3D 100%)"
+        "secondary": "#D1C4E9"
     },
     "green": {
         "name": "清新绿色",
@@ -90,8 +196,7 @@ THEMES = {
         "title": "#FFFFFF",
         "text": "#E8F5E9",
         "accent": "#66BB6A",
-        "secondary": "#C8E6C9",
-        "gradient": "linear-gradient(135deg, #0D1F12 0%, #1B3A26 100%)"
+        "secondary": "#C8E6C9"
     },
     "orange": {
         "name": "温暖橙色",
@@ -101,8 +206,7 @@ THEMES = {
         "title": "#FFFFFF",
         "text": "#FFF3E0",
         "accent": "#FFA726",
-        "secondary": "#FFCCBC",
-        "gradient": "linear-gradient(135deg, #1F1410 0%, #3D2415 100%)"
+        "secondary": "#FFCCBC"
     },
     "pink": {
         "name": "玫瑰粉色",
@@ -112,8 +216,7 @@ THEMES = {
         "title": "#FFFFFF",
         "text": "#FCE4EC",
         "accent": "#F06292",
-        "secondary": "#F8BBD0",
-        "gradient": "linear-gradient(135deg, #1F0A14 0%, #3D1528 100%)"
+        "secondary": "#F8BBD0"
     },
     "teal": {
         "name": "冷色青绿",
@@ -123,8 +226,7 @@ THEMES = {
         "title": "#FFFFFF",
         "text": "#E0F2F1",
         "accent": "#26A69A",
-        "secondary": "#B2DFDB",
-        "gradient": "linear-gradient(135deg, #0A1F1F 0%, #164E4D 100%)"
+        "secondary": "#B2DFDB"
     },
     "gray": {
         "name": "中性灰色",
@@ -134,15 +236,24 @@ THEMES = {
         "title": "#FFFFFF",
         "text": "#F5F5F5",
         "accent": "#9E9E9E",
-        "secondary": "#E0E0E0",
-        "gradient": "linear-gradient(135deg, #1A1A1D 0%, #2D2D30 100%)"
+        "secondary": "#E0E0E0"
     }
 }
 
+THEMES = {key: Theme(**value) for key, value in _RAW_THEMES.items()}
+
 # ============================================================================
 # 资讯分类定义
 # ============================================================================
-CATEGORIES = {
+@dataclass(frozen=True, slots=True)
+class Category:
+    """资讯分类"""
+    name: str
+    icon: str
+    description: str
+
+
+_RAW_CATEGORIES = {
     "model": {
         "name": "模型发布",
         "icon": "🤖",
@@ -175,6 +286,8 @@ CATEGORIES = {
     }
 }
 
+CATEGORIES = {key: Category(**value) for key, value in _RAW_CATEGORIES.items()}
+
 # ============================================================================
 # 内容类型到主题的映射
 # ============================================================================
@@ -215,8 +328,8 @@ HTML_TEMPLATE_CONFIG = {
 # ============================================================================
 # 图片生成 API 配置 (Firefly Card API)
 # ============================================================================
-FIREFLY_API_URL = os.getenv("FIREFLY_API_URL", "https://fireflycard-api.302ai.cn/api/saveImg")
-FIREFLY_API_KEY = os.getenv("FIREFLY_API_KEY", "")  # 如果需要 API Key
+FIREFLY_API_URL = _cfg.firefly_api_url
+FIREFLY_API_KEY = _cfg.firefly_api_key
 
 # Firefly Card API 默认配置
 FIREFLY_DEFAULT_CONFIG = {
@@ -254,22 +367,32 @@ FIREFLY_DEFAULT_CONFIG = {
 }
 
 # 是否启用图片生成功能
-ENABLE_IMAGE_GENERATION = os.getenv("ENABLE_IMAGE_GENERATION", "false").lower() == "true"
+ENABLE_IMAGE_GENERATION = _cfg.enable_image_generation
+
+# 图片本地缓存：相同请求直接复用上次生成的图片，设为 false 可强制重新调用 API
+# 缓存目录默认在仓库根目录的 .cache/ 下，不在发布的输出目录内
+ENABLE_IMAGE_CACHE = _cfg.enable_image_cache
+IMAGE_CACHE_DIR = _cfg.image_cache_dir
+
+# 小红书封面内嵌字体目录：存放 NotoSansSC-900.woff2 这类子集字体，留空则使用 Google Fonts
+XHS_FONT_DIR = _cfg.xhs_font_dir
 
 # ============================================================================
 # 钉钉机器人配置
 # ============================================================================
-DINGTALK_WEBHOOK_URL = os.getenv("DINGTALK_WEBHOOK_URL")  # Webhook URL
-DINGTALK_SECRET = os.getenv("DINGTALK_SECRET")            # 加签密钥
-ENABLE_DINGTALK = os.getenv("ENABLE_DINGTALK", "false").lower() == "true"
+DINGTALK_WEBHOOK_URL = _cfg.dingtalk_webhook_url  # Webhook URL
+DINGTALK_SECRET = _cfg.dingtalk_secret            # 加签密钥
+ENABLE_DINGTALK = _cfg.enable_dingtalk
 
 
-def get_theme(theme_name: str) -> dict:
+@lru_cache(maxsize=16)
+def get_theme(theme_name: str) -> Theme:
     """获取指定主题配置"""
     return THEMES.get(theme_name, THEMES[DEFAULT_THEME])
 
 
-def get_category_info(category_key: str) -> dict:
+@lru_cache(maxsize=16)
+def get_category_info(category_key: str) -> Category:
     """获取分类信息"""
     return CATEGORIES.get(category_key, CATEGORIES["model"])
 
@@ -283,8 +406,11 @@ def guess_theme_from_content(content_analysis: dict) -> str:
     if not categories:
         return DEFAULT_THEME
 
-    # 找到包含最多资讯的分类
-    max_category = max(categories, key=lambda x: len(x.get("items", [])))
-    category_key = max_category.get("key", "")
+    # 找到包含最多资讯的分类（并列时取靠前者）
+    best_key, best_count = "", -1
+    for category in categories:
+        count = len(category.get("items") or ())
+        if count > best_count:
+            best_count, best_key = count, category.get("key", "")
 
-    return CATEGORY_THEME_MAP.get(category_key, DEFAULT_THEME)
+    return CATEGORY_THEME_MAP.get(best_key, DEFAULT_THEME)
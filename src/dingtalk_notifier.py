@@ -7,7 +7,6 @@ import hmac
 import hashlib
 import base64
 import urllib.parse
-import requests
 from typing import Optional, Dict, Any
 
 from src.config import (
@@ -16,6 +15,7 @@ from src.config import (
     ENABLE_DINGTALK,
     GITHUB_PAGES_URL
 )
+from src.utils import dumps, get_session
 
 
 class DingTalkNotifier:
@@ -31,6 +31,15 @@ class DingTalkNotifier:
         """
         self.webhook_url = webhook_url or DINGTALK_WEBHOOK_URL
         self.secret = secret or DINGTALK_SECRET
+        self._configured = bool(self.webhook_url and ENABLE_DINGTALK)
+
+        # 预先完成 HMAC 密钥调度，签名时只需 copy() 模板
+        self._hmac_template = None
+        if self.secret:
+            self._hmac_template = hmac.new(
+                self.secret.encode('utf-8'),
+                digestmod=hashlib.sha256
+            )
 
     def _generate_sign(self) -> tuple:
         """
@@ -40,14 +49,10 @@ class DingTalkNotifier:
             (timestamp, sign) 元组
         """
         timestamp = str(round(time.time() * 1000))
-        secret_enc = self.secret.encode('utf-8')
         string_to_sign = f'{timestamp}\n{self.secret}'
-        string_to_sign_enc = string_to_sign.encode('utf-8')
-        hmac_code = hmac.new(
-            secret_enc,
-            string_to_sign_enc,
-            digestmod=hashlib.sha256
-        ).digest()
+        h = self._hmac_template.copy()
+        h.update(string_to_sign.encode('utf-8'))
+        hmac_code = h.digest()
         sign = urllib.parse.quote_plus(base64.b64encode(hmac_code))
         return timestamp, sign
 
@@ -60,7 +65,7 @@ class DingTalkNotifier:
 
     def _is_configured(self) -> bool:
         """检查是否已配置"""
-        return bool(self.webhook_url and ENABLE_DINGTALK)
+        return self._configured
 
     def send_markdown(self, title: str, content: str) -> bool:
         """
@@ -86,7 +91,12 @@ class DingTalkNotifier:
         }
 
         try:
-            response = requests.post(url, json=data, timeout=10)
+            response = get_session().post(
+                url,
+                data=dumps(data),
+                headers={"Content-Type": "application/json; charset=utf-8"},
+                timeout=10
+            )
             result = response.json()
             if result.get("errcode") == 0:
                 print(f"✅ 钉钉消息发送成功: {title}")
@@ -109,40 +119,47 @@ class DingTalkNotifier:
         Returns:
             是否发送成功
         """
+        # 未配置时直接返回，避免无谓地构建消息内容
+        if not self._configured:
+            return False
+
         date = result.get("date", "")
         summary = result.get("summary", [])
         categories = result.get("categories", [])
         keywords = result.get("keywords", [])
 
-        # 统计各分类资讯数
-        stats = []
-        total = 0
-        for cat in categories:
-            count = len(cat.get("items", []))
-            total += count
-            if count > 0:
-                stats.append(f"- {cat.get('icon', '')} {cat.get('name', '')}: {count} 条")
+        # 统计各分类资讯数：先展开为 (图标, 名称, 条数)，再统一格式化
+        cat_counts = [
+            (cat.get("icon", ""), cat.get("name", ""), len(cat.get("items") or ()))
+            for cat in categories
+        ]
+        total = sum(count for _, _, count in cat_counts)
+        stats = [
+            f"- {icon} {name}: {count} 条"
+            for icon, name, count in cat_counts
+            if count > 0
+        ]
 
         # 构建 Markdown 内容
-        content = f"## 📰 AI Daily · {date}\n\n"
-        
+        parts = [f"## 📰 AI Daily · {date}", ""]
+
         # 今日摘要
-        content += "### 📌 今日核心摘要\n"
-        for s in summary[:5]:
-            content += f"- {s}\n"
-        
+        parts.append("### 📌 今日核心摘要")
+        parts.extend(f"- {s}" for s in summary[:5])
+
         # 资讯统计
         if stats:
-            content += f"\n### 📊 资讯统计（共 {total} 条）\n"
-            content += "\n".join(stats)
-        
+            parts.extend(["", f"### 📊 资讯统计（共 {total} 条）"])
+            parts.extend(stats)
+
         # 关键词
         if keywords:
-            content += f"\n\n### 🏷️ 关键词\n"
-            content += " · ".join(keywords[:8])
+            parts.extend(["", "### 🏷️ 关键词", " · ".join(keywords[:8])])
 
         # 详情链接
-        content += f"\n\n---\n\n[🔗 点击查看完整日报]({page_url})"
+        parts.extend(["", "---", "", f"[🔗 点击查看完整日报]({page_url})"])
+
+        content = "\n".join(parts)
 
         title = f"📰 AI Daily · {date}"
         return self.send_markdown(title, content)
@@ -158,6 +175,9 @@ class DingTalkNotifier:
         Returns:
             是否发送成功
         """
+        if not self._configured:
+            return False
+
         content = f"## ❌ AI Daily 生成失败\n\n"
         content += f"**目标日期**: {date}\n\n"
         content += f"**错误信息**: {error}\n\n"
@@ -11,6 +11,7 @@ from pathlib import Path
 from src.config import (
     OUTPUT_DIR,
     THEMES,
+    Theme,
     SITE_META,
     GITHUB_PAGES_URL
 )
@@ -50,7 +51,7 @@ class HTMLGenerator:
 
         print(f"📄 正在生成 HTML 页面...")
         print(f"   日期: {date}")
-        print(f"   主题: {theme['name']}")
+        print(f"   主题: {theme.name}")
 
         # 构建 HTML
         html_content = self._build_daily_html(result, theme)
@@ -119,7 +120,7 @@ class HTMLGenerator:
         print(f"✅ 空页面生成成功: {filepath}")
         return str(filepath)
 
-    def _build_daily_html(self, result: Dict[str, Any], theme: Dict[str, str]) -> str:
+    def _build_daily_html(self, result: Dict[str, Any], theme: Theme) -> str:
         """构建日报 HTML"""
         date = result.get("date", "")
         summary = result.get("summary", [])
@@ -4,22 +4,216 @@
 根据内容长度和结构智能调整尺寸和排版参数
 """
 import os
+import time
 import base64
-import requests
-from typing import Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+import shutil
+import hashlib
+from bisect import bisect_left, bisect_right
+from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass
 
 from src.config import (
     FIREFLY_API_URL,
     FIREFLY_API_KEY,
     FIREFLY_DEFAULT_CONFIG,
     ENABLE_IMAGE_GENERATION,
+    ENABLE_IMAGE_CACHE,
+    IMAGE_CACHE_DIR,
     OUTPUT_DIR
 )
-
-
-@dataclass
+from src.utils import dumps, ensure_dir, get_session, parse_date
+
+
+# 已挂载重试适配器的 Firefly API 地址
+_RETRY_MOUNTED = set()
+
+
+def _firefly_session(api_url: str):
+    """获取共享会话，并为 Firefly API 地址挂载带有限重试的适配器"""
+    session = get_session()
+    if api_url not in _RETRY_MOUNTED:
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # 仅对连接类错误做有限重试（POST 不在默认可重试方法内，不会重复提交已送达的请求）
+        retry = Retry(total=2, backoff_factor=0.5)
+        session.mount(api_url, HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry))
+        _RETRY_MOUNTED.add(api_url)
+    return session
+
+
+# 生成图片的本地缓存最多保留的文件数
+_CACHE_LIMIT = 64
+# 超过该时长（秒）的 .part 文件视为中断下载的残留
+_STALE_PART_AGE = 600
+
+
+def _prune_cache(cache_dir, limit: int = _CACHE_LIMIT) -> None:
+    """按修改时间淘汰旧缓存，只保留最近的 limit 个文件，并清理残留的 .part 文件"""
+    stale_before = time.time() - _STALE_PART_AGE
+    entries = []
+    removed = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                try:
+                    if not entry.is_file():
+                        continue
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    # 扫描期间被删除的文件直接跳过
+                    continue
+                if entry.name.endswith(".png"):
+                    entries.append((mtime, entry.path))
+                elif entry.name.endswith(".part") and mtime < stale_before:
+                    removed.append(entry.path)
+    except OSError:
+        return
+    if len(entries) > limit:
+        entries.sort(reverse=True)
+        removed += [path for _, path in entries[limit:]]
+    for path in removed:
+        _remove_quietly(path)
+
+
+def _remove_quietly(path) -> None:
+    """删除文件，文件不存在或删除失败时忽略"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _copy_atomic(src, dst: str) -> None:
+    """先复制到同目录临时文件再原子替换，避免留下写了一半的图片"""
+    tmp = f"{dst}.part"
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        _remove_quietly(tmp)
+        raise
+
+
+# 当天日期字符串缓存（最多每分钟重新格式化一次，用于默认文件名）
+_TODAY = None
+_TODAY_AT = 0.0
+
+
+def _today_str() -> str:
+    """获取当天日期字符串 YYYY-MM-DD"""
+    global _TODAY, _TODAY_AT
+    now = time.time()
+    if _TODAY is None or now - _TODAY_AT > 60:
+        _TODAY = datetime.now().strftime("%Y-%m-%d")
+        _TODAY_AT = now
+    return _TODAY
+
+
+# Markdown 行类型编号
+_LINE_BLANK, _LINE_TEXT, _LINE_BOLD, _LINE_LIST, _LINE_H1, _LINE_H2, _LINE_H3 = range(7)
+
+# Markdown 行前缀（标题按从长到短匹配）
+_LIST_PREFIXES = ("- ", "* ")
+_BOLD_PREFIX = "**"
+
+# 图片宽高比分档：宽/高 严格大于某阈值时落入更宽的比例
+_RATIO_THRESHOLDS = (0.4, 0.5, 0.7, 0.85)
+_RATIO_LABELS = ("9:19", "9:16", "2:3", "3:4", "1:1")
+
+# 标题类型对应的 Markdown 标记
+_HEADING_MARKS = {_LINE_H1: "#", _LINE_H2: "##", _LINE_H3: "###"}
+
+# 标题行固定占用的行数（标题级别越高占位越多）
+_HEADING_LINES = {_LINE_H1: 3.0, _LINE_H2: 2.5, _LINE_H3: 2.0}
+
+# 其余行的 (最少行数, 换行余量系数)
+_WRAP_FACTORS = {
+    _LINE_LIST: (1.5, 1.5),   # 列表项需要考虑换行，使用 1.5 倍余量
+    _LINE_BOLD: (1.5, 1.3),   # 粗体标题
+    _LINE_TEXT: (1.3, 1.3),   # 普通文本，使用 1.3 倍余量
+}
+
+_BLANK_LINE = (_LINE_BLANK, 0)
+
+
+def _classify_line(stripped: str) -> int:
+    """根据前缀判断非空行的类型"""
+    first = stripped[0]
+    if first == "#":
+        if stripped.startswith("### "):
+            return _LINE_H3
+        if stripped.startswith("## "):
+            return _LINE_H2
+        if stripped.startswith("# "):
+            return _LINE_H1
+        return _LINE_TEXT
+    if first == "-" or first == "*":
+        if stripped.startswith(_LIST_PREFIXES):
+            return _LINE_LIST
+        if stripped.startswith(_BOLD_PREFIX):
+            return _LINE_BOLD
+    return _LINE_TEXT
+
+
+def _scan_lines(content: str) -> List[Tuple[int, int]]:
+    """
+    逐行扫描 Markdown 内容
+
+    Returns:
+        每行的 (行类型, 去除首尾空白后的字符数)
+    """
+    scanned = []
+    for line in content.split("\n"):
+        stripped = line.strip()
+        if stripped:
+            scanned.append((_classify_line(stripped), len(stripped)))
+        else:
+            scanned.append(_BLANK_LINE)
+    return scanned
+
+
+# 内容复杂度分档：内容行数达到阈值时进入下一档
+_COMPLEXITY_THRESHOLDS = (12, 22, 38)
+_COMPLEXITY_LABELS = ("simple", "standard", "detailed", "complete")
+
+# 各复杂度的基础排版配置（只读）
+_COMPLEXITY_CONFIGS = MappingProxyType({
+    "simple": MappingProxyType({
+        "width": 500,
+        "padding": 16,
+        "fontScale": 1.0,
+        "base_height": 150,
+        "line_height": 30,
+    }),
+    "standard": MappingProxyType({
+        "width": 560,
+        "padding": 18,
+        "fontScale": 1.05,
+        "base_height": 180,
+        "line_height": 32,
+    }),
+    "detailed": MappingProxyType({
+        "width": 620,
+        "padding": 20,
+        "fontScale": 1.1,
+        "base_height": 200,
+        "line_height": 34,
+    }),
+    "complete": MappingProxyType({
+        "width": 680,
+        "padding": 22,
+        "fontScale": 1.15,
+        "base_height": 220,
+        "line_height": 36,
+    })
+})
+
+
+@dataclass(slots=True)
 class ContentAnalysis:
     """内容分析结果"""
     total_lines: int          # 总行数
@@ -48,18 +242,29 @@ class ImageGenerator:
     LINE_HEIGHT_RATIO = 1.8   # 行高与字号比 - 增加以获得更好效果
     PADDING_RATIO = 0.08      # 边距占宽度比例 - 减少 padding
 
-    def __init__(self, api_url: str = None, api_key: str = None):
+    def __init__(
+        self,
+        api_url: str = None,
+        api_key: str = None,
+        use_cache: Optional[bool] = None,
+        cache_dir: str = None
+    ):
         """
         初始化图片生成器
 
         Args:
             api_url: Firefly API 地址
             api_key: API 密钥（如果需要）
+            use_cache: 是否复用本地缓存的图片，默认取 ENABLE_IMAGE_CACHE
+            cache_dir: 图片缓存目录，默认取 IMAGE_CACHE_DIR
         """
         self.api_url = api_url or FIREFLY_API_URL
         self.api_key = api_key or FIREFLY_API_KEY
-        self.default_config = FIREFLY_DEFAULT_CONFIG.copy()
         self.enabled = ENABLE_IMAGE_GENERATION
+        self.use_cache = ENABLE_IMAGE_CACHE if use_cache is None else use_cache
+        self.cache_dir = Path(cache_dir or IMAGE_CACHE_DIR)
+        # 默认配置的只读视图：generate 每次都构建新的请求字典，无需复制
+        self.default_config = MappingProxyType(FIREFLY_DEFAULT_CONFIG)
 
     def _analyze_content(self, content: str) -> ContentAnalysis:
         """
@@ -71,50 +276,53 @@ class ImageGenerator:
         Returns:
             内容分析结果
         """
-        lines = content.split('\n')
-        analysis = ContentAnalysis(
-            total_lines=len(lines),
-            content_lines=0,
-            headings={"#": 0, "##": 0, "###": 0},
-            list_items=0,
-            categories=0,
-            max_line_length=0,
-            total_chars=0,
-            complexity="simple"
-        )
+        return self._analyze_lines(_scan_lines(content))
 
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                continue
+    def _analyze_lines(self, scanned: List[Tuple[int, int]]) -> ContentAnalysis:
+        """
+        根据逐行扫描结果统计内容结构
 
-            analysis.content_lines += 1
-            analysis.total_chars += len(stripped)
-            analysis.max_line_length = max(analysis.max_line_length, len(stripped))
-
-            # 统计标题
-            if stripped.startswith("# "):
-                analysis.headings["#"] += 1
-            elif stripped.startswith("## "):
-                analysis.headings["##"] += 1
-            elif stripped.startswith("### "):
-                analysis.headings["###"] += 1
-                analysis.categories += 1
-            # 统计列表项
-            elif stripped.startswith("- ") or stripped.startswith("* "):
-                analysis.list_items += 1
-
-        # 判断复杂度
-        if analysis.content_lines < 12:
-            analysis.complexity = "simple"
-        elif analysis.content_lines < 22:
-            analysis.complexity = "standard"
-        elif analysis.content_lines < 38:
-            analysis.complexity = "detailed"
-        else:
-            analysis.complexity = "complete"
+        Args:
+            scanned: _scan_lines 的返回值
 
-        return analysis
+        Returns:
+            内容分析结果
+        """
+        # 计数器使用局部变量，循环结束后一次性写入结果对象
+        content_lines = 0
+        total_chars = 0
+        max_line_length = 0
+        list_items = 0
+        headings = {"#": 0, "##": 0, "###": 0}
+
+        for kind, length in scanned:
+            if kind == _LINE_BLANK:
+                continue
+
+            content_lines += 1
+            total_chars += length
+            if length > max_line_length:
+                max_line_length = length
+
+            # 统计标题和列表项
+            if kind in _HEADING_MARKS:
+                headings[_HEADING_MARKS[kind]] += 1
+            elif kind == _LINE_LIST:
+                list_items += 1
+
+        # 判断复杂度（内容行数 < 12 为 simple，< 22 为 standard，< 38 为 detailed）
+        complexity = _COMPLEXITY_LABELS[bisect_right(_COMPLEXITY_THRESHOLDS, content_lines)]
+
+        return ContentAnalysis(
+            total_lines=len(scanned),
+            content_lines=content_lines,
+            headings=headings,
+            list_items=list_items,
+            categories=headings["###"],  # 每个三级标题对应一个分类
+            max_line_length=max_line_length,
+            total_chars=total_chars,
+            complexity=complexity
+        )
 
     def _get_optimal_config(self, analysis: ContentAnalysis) -> Dict[str, Any]:
         """
@@ -126,39 +334,7 @@ class ImageGenerator:
         Returns:
             最优配置字典
         """
-        # 根据复杂度确定基础配置
-        configs = {
-            "simple": {
-                "width": 500,
-                "padding": 16,
-                "fontScale": 1.0,
-                "base_height": 150,
-                "line_height": 30,
-            },
-            "standard": {
-                "width": 560,
-                "padding": 18,
-                "fontScale": 1.05,
-                "base_height": 180,
-                "line_height": 32,
-            },
-            "detailed": {
-                "width": 620,
-                "padding": 20,
-                "fontScale": 1.1,
-                "base_height": 200,
-                "line_height": 34,
-            },
-            "complete": {
-                "width": 680,
-                "padding": 22,
-                "fontScale": 1.15,
-                "base_height": 220,
-                "line_height": 36,
-            }
-        }
-
-        base_config = configs.get(analysis.complexity, configs["standard"])
+        base_config = _COMPLEXITY_CONFIGS.get(analysis.complexity, _COMPLEXITY_CONFIGS["standard"])
 
         # 根据最长行调整宽度
         # 确保最长行能舒适显示（每行约 CHAR_PER_LINE 个字符）
@@ -189,8 +365,9 @@ class ImageGenerator:
         Returns:
             (width, height, ratio, config)
         """
-        # 分析内容
-        analysis = self._analyze_content(content)
+        # 逐行扫描一次，分析与行数估算共用结果
+        scanned = _scan_lines(content)
+        analysis = self._analyze_lines(scanned)
 
         # 获取最优配置
         opt_config = self._get_optimal_config(analysis)
@@ -206,35 +383,29 @@ class ImageGenerator:
         # 计算需要的行数（考虑换行，使用保守估算）
         estimated_lines = 0
 
-        for line in content.split('\n'):
-            stripped = line.strip()
-            if not stripped:
+        # 内容高度达到该值后必然被截断为 MAX_HEIGHT，无需继续估算
+        height_budget = self.MAX_HEIGHT - base_height
+
+        # 每字符占用的行数在循环外算好，逐行只需一次乘法
+        wrap = {
+            kind: (min_lines, self.AVG_CHAR_WIDTH * factor / content_width)
+            for kind, (min_lines, factor) in _WRAP_FACTORS.items()
+        }
+
+        for kind, text_len in scanned:
+            if estimated_lines * line_height * 1.2 >= height_budget:
+                break
+
+            if kind == _LINE_BLANK:
                 # 空行也占用空间
                 estimated_lines += 0.5
-                continue
-
-            # 去除 Markdown 标记后的纯文本长度
-            text_len = len(stripped)
-
-            # 根据元素类型估算行数（使用保守值，乘以系数增加余量）
-            if stripped.startswith("# "):
-                estimated_lines += 3.0  # 一级标题占位更多
-            elif stripped.startswith("## "):
-                estimated_lines += 2.5
-            elif stripped.startswith("### "):
-                estimated_lines += 2.0
-            elif stripped.startswith("- ") or stripped.startswith("* "):
-                # 列表项需要考虑换行，使用 1.5 倍余量
-                lines_needed = max(1.5, (text_len * self.AVG_CHAR_WIDTH * 1.5) / content_width)
-                estimated_lines += lines_needed
-            elif stripped.startswith("**"):
-                # 粗体标题
-                lines_needed = max(1.5, (text_len * self.AVG_CHAR_WIDTH * 1.3) / content_width)
-                estimated_lines += lines_needed
+            elif kind in _HEADING_LINES:
+                # 根据元素类型估算行数（使用保守值，乘以系数增加余量）
+                estimated_lines += _HEADING_LINES[kind]
             else:
-                # 普通文本，使用 1.3 倍余量
-                lines_needed = max(1.3, (text_len * self.AVG_CHAR_WIDTH * 1.3) / content_width)
-                estimated_lines += lines_needed
+                min_lines, per_char = wrap[kind]
+                lines_needed = text_len * per_char
+                estimated_lines += lines_needed if lines_needed > min_lines else min_lines
 
         # 计算高度，增加 20% 安全余量
         content_height = int(estimated_lines * line_height * 1.2)
@@ -245,16 +416,7 @@ class ImageGenerator:
 
         # 计算最接近的比例
         ratio_wh = width / total_height
-        if ratio_wh > 0.85:
-            ratio = "1:1"
-        elif ratio_wh > 0.7:
-            ratio = "3:4"
-        elif ratio_wh > 0.5:
-            ratio = "2:3"
-        elif ratio_wh > 0.4:
-            ratio = "9:16"
-        else:
-            ratio = "9:19"
+        ratio = _RATIO_LABELS[bisect_left(_RATIO_THRESHOLDS, ratio_wh)]
 
         # 打印调试信息
         print(f"   内容分析: 复杂度={analysis.complexity}, 行数={analysis.content_lines}")
@@ -287,41 +449,67 @@ class ImageGenerator:
             print("   内容为空，跳过图片生成")
             return None
 
-        # 构建请求数据
-        request_data = self.default_config.copy()
+        # 延迟导入：图片生成未启用时不承担 requests 的导入开销
+        import requests
 
         # 计算最佳尺寸和配置
         width, height, ratio, opt_config = self._calculate_dimensions(markdown_content)
 
-        # 应用智能配置
-        request_data["width"] = width
-        request_data["height"] = height
-        request_data["ratio"] = ratio
-        request_data["padding"] = opt_config["padding"]
-        request_data["fontScale"] = opt_config["fontScale"]
-
-        # 用户自定义配置可以覆盖
-        if custom_config:
-            request_data.update(custom_config)
-
-        request_data["content"] = markdown_content
+        # 构建请求数据：默认配置 < 智能配置 < 用户自定义配置，最后写入内容
+        request_data = {
+            **self.default_config,
+            "width": width,
+            "height": height,
+            "ratio": ratio,
+            "padding": opt_config["padding"],
+            "fontScale": opt_config["fontScale"],
+            **(custom_config or {}),
+            "content": markdown_content,
+        }
 
         # 如果有 API Key，添加到请求头
+        # 响应为已压缩的 PNG，关闭传输压缩避免无意义的 gzip 编解码
         headers = {
-            "Content-Type": "application/json"
+            "Content-Type": "application/json; charset=utf-8",
+            "Accept-Encoding": "identity"
         }
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
 
+        # 请求体只序列化一次：既用于计算缓存键，也直接作为 POST 数据发送
+        body = dumps(request_data)
+
+        # 命中缓存时直接复制上次生成的图片
+        cache_dir = self.cache_dir
+        cache_file = cache_dir / f"{hashlib.sha256(body).hexdigest()}.png"
+        if not output_path:
+            output_path = str(Path(OUTPUT_DIR) / "images" / f"{_today_str()}.png")
+            default_output = True
+        else:
+            default_output = False
+        if self.use_cache and cache_file.is_file():
+            try:
+                ensure_dir(Path(output_path).parent)
+                _copy_atomic(cache_file, output_path)
+                os.utime(cache_file)
+                print(f"   命中图片缓存: {cache_file.name}")
+                print(f"   图片已保存: {output_path}")
+                return output_path
+            except OSError as e:
+                print(f"   读取图片缓存失败，重新生成: {e}")
+
+        response = None
         try:
             print(f"   正在调用 Firefly API 生成图片...")
             print(f"   API URL: {self.api_url}")
 
-            response = requests.post(
+            # stream=True：图片响应边下载边写盘，不在内存中缓存整张图片
+            response = _firefly_session(self.api_url).post(
                 self.api_url,
-                json=request_data,
+                data=body,
                 headers=headers,
-                timeout=60
+                timeout=(5, 60),
+                stream=True
             )
 
             # 检查响应状态
@@ -332,24 +520,27 @@ class ImageGenerator:
 
             # 如果直接返回二进制图片流
             if 'image/' in content_type:
-                image_bytes = response.content
-
-                # 确定保存路径
-                if not output_path:
-                    output_dir = Path(OUTPUT_DIR) / "images"
-                    output_dir.mkdir(parents=True, exist_ok=True)
-                    # 使用日期作为文件名
-                    from datetime import datetime
-                    date_str = datetime.now().strftime("%Y-%m-%d")
-                    output_path = str(output_dir / f"{date_str}.png")
-
-                # 保存图片
-                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-                with open(output_path, 'wb') as f:
-                    f.write(image_bytes)
+                # 分块写入临时文件，下载完整后再原子替换；启用缓存时先放入缓存再复制到保存路径
+                target = cache_file if self.use_cache else Path(output_path)
+                ensure_dir(target.parent)
+                tmp_file = target.with_name(f"{target.name}.part")
+                try:
+                    with open(tmp_file, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=64 * 1024):
+                            f.write(chunk)
+                    os.replace(tmp_file, target)
+                except BaseException:
+                    # 下载中断时删除写了一半的临时文件
+                    _remove_quietly(tmp_file)
+                    raise
+
+                if self.use_cache:
+                    _prune_cache(cache_dir)
+                    ensure_dir(Path(output_path).parent)
+                    _copy_atomic(cache_file, output_path)
 
                 print(f"   图片已保存: {output_path}")
-                print(f"   文件大小: {len(image_bytes)} bytes")
+                print(f"   文件大小: {os.path.getsize(output_path)} bytes")
                 return output_path
 
             # 如果返回 JSON（兼容其他可能的响应格式）
@@ -370,14 +561,14 @@ class ImageGenerator:
 
                         image_bytes = base64.b64decode(image_data)
 
-                        if not output_path:
-                            output_dir = Path(OUTPUT_DIR) / "images"
-                            output_dir.mkdir(parents=True, exist_ok=True)
-                            output_path = str(output_dir / "daily-card.png")
+                        if default_output:
+                            output_path = str(Path(OUTPUT_DIR) / "images" / "daily-card.png")
 
-                        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-                        with open(output_path, 'wb') as f:
+                        ensure_dir(Path(output_path).parent)
+                        tmp_path = f"{output_path}.part"
+                        with open(tmp_path, 'wb') as f:
                             f.write(image_bytes)
+                        os.replace(tmp_path, output_path)
 
                         print(f"   图片已保存: {output_path}")
                         return output_path
@@ -401,6 +592,10 @@ class ImageGenerator:
         except Exception as e:
             print(f"   图片生成失败: {e}")
             return None
+        finally:
+            # 流式响应需显式关闭，连接才能归还连接池
+            if response is not None:
+                response.close()
 
     def generate_from_analysis_result(
         self,
@@ -435,16 +630,12 @@ class ImageGenerator:
         categories = result.get("categories", [])
         keywords = result.get("keywords", [])
 
-        # 格式化日期
-        try:
-            from datetime import datetime
-            dt = datetime.strptime(date, "%Y-%m-%d")
-            formatted_date = f"{dt.year}年{dt.month}月{dt.day}日"
-        except:
-            formatted_date = date
+        # 格式化日期（正则拆分，无需 strptime；日期缺失或不合法时保持原值）
+        parsed = parse_date(date)
+        formatted_date = f"{parsed.year}年{parsed.month}月{parsed.day}日" if parsed else date
 
         # 构建标题
-        lines = [f"# AI Daily\n## {formatted_date}\n"]
+        lines = ["# AI Daily", f"## {formatted_date}", ""]
 
         # 核心摘要
         if summary:
@@ -469,7 +660,7 @@ class ImageGenerator:
 
         # 关键词
         if keywords:
-            lines.append(f"{' '.join(['#' + kw for kw in keywords[:8]])}")
+            lines.append("#" + " #".join(keywords[:8]))
 
         return "\n".join(lines)
 
@@ -479,6 +670,8 @@ def generate_card_image(
     output_path: str = None
 ) -> Optional[str]:
     """便捷函数：生成卡片图片"""
+    if not ENABLE_IMAGE_GENERATION:
+        return None
     generator = ImageGenerator()
     return generator.generate(markdown_content, output_path)
 
@@ -488,5 +681,7 @@ def generate_card_from_analysis(
     output_path: str = None
 ) -> Optional[str]:
     """便捷函数：从分析结果生成卡片图片"""
+    if not ENABLE_IMAGE_GENERATION:
+        return None
     generator = ImageGenerator()
     return generator.generate_from_analysis_result(analysis_result, output_path)
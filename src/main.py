@@ -23,9 +23,6 @@ from src.rss_fetcher import RSSFetcher
 from src.claude_analyzer import ClaudeAnalyzer
 from src.html_generator import HTMLGenerator
 from src.notifier import EmailNotifier
-from src.image_generator import ImageGenerator
-from src.xiaohongshu_generator import XiaohongshuGenerator
-from src.dingtalk_notifier import DingTalkNotifier
 
 
 def print_banner():
@@ -157,6 +154,10 @@ def main():
         image_path = None
         xhs_path = None
         if image_enabled:
+            # 按需导入：图片生成未启用时不加载相关模块
+            from src.image_generator import ImageGenerator
+            from src.xiaohongshu_generator import XiaohongshuGenerator
+
             print(f"[步骤 5/{total_steps}] 生成分享卡片图片...")
             image_gen = ImageGenerator()
             image_path = image_gen.generate_from_analysis_result(
@@ -190,6 +191,8 @@ def main():
 
         # 8. 发送钉钉通知（可选）
         if dingtalk_enabled:
+            from src.dingtalk_notifier import DingTalkNotifier
+
             step_num = total_steps  # 钉钉是最后一步
             print(f"[步骤 {step_num}/{total_steps}] 发送钉钉通知...")
             dingtalk = DingTalkNotifier()
@@ -201,16 +204,20 @@ def main():
             print("   (钉钉通知未配置，跳过)")
             print()
 
-        # 完成
-        print("╔════════════════════════════════════════════════════════════╗")
-        print("║                                                              ║")
-        print("║   ✅ 任务完成!                                              ║")
-        print("║                                                              ║")
-        print(f"║   日期: {target_date}                                        ║")
-        print(f"║   资讯数: {total_items} 条                                          ║")
-        print(f"║   主题: {result.get('theme', 'blue')}                                                ║")
-        print("║                                                              ║")
-        print("╚════════════════════════════════════════════════════════════╝")
+        # 完成（整个结束框一次写出）
+        print(
+            "\n".join([
+                "╔════════════════════════════════════════════════════════════╗",
+                "║                                                              ║",
+                "║   ✅ 任务完成!                                              ║",
+                "║                                                              ║",
+                f"║   日期: {target_date}                                        ║",
+                f"║   资讯数: {total_items} 条                                          ║",
+                f"║   主题: {result.get('theme', 'blue')}                                                ║",
+                "║                                                              ║",
+                "╚════════════════════════════════════════════════════════════╝",
+            ])
+        )
 
     except KeyboardInterrupt:
         print("\n⚠️ 用户中断")
@@ -2,7 +2,6 @@
 邮件通知模块
 发送任务执行结果的邮件通知
 """
-import os
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -15,7 +14,10 @@ from src.config import (
     SMTP_USER,
     SMTP_PASSWORD,
     NOTIFICATION_TO,
-    GITHUB_PAGES_URL
+    GITHUB_PAGES_URL,
+    GITHUB_REPOSITORY,
+    GITHUB_RUN_ID,
+    GITHUB_SERVER_URL
 )
 
 
@@ -47,9 +49,9 @@ class EmailNotifier:
         self.to_email = to_email or NOTIFICATION_TO
 
         # GitHub Actions 环境变量（用于生成日志链接）
-        self.github_repository = os.getenv("GITHUB_REPOSITORY")
-        self.github_run_id = os.getenv("GITHUB_RUN_ID")
-        self.github_server_url = os.getenv("GITHUB_SERVER_URL", "https://github.com")
+        self.github_repository = GITHUB_REPOSITORY
+        self.github_run_id = GITHUB_RUN_ID
+        self.github_server_url = GITHUB_SERVER_URL
 
     def _get_actions_url(self) -> Optional[str]:
         """获取 GitHub Actions 运行日志链接"""
@@ -59,7 +61,7 @@ class EmailNotifier:
 
     def _get_page_url(self, date: str) -> str:
         """获取生成的页面 URL"""
-        base_url = GITHUB_PAGES_URL or os.getenv("GITHUB_PAGES_URL", "")
+        base_url = GITHUB_PAGES_URL
         if base_url:
             return f"{base_url.rstrip('/')}/{date}.html"
         return f"{date}.html"
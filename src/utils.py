@@ -0,0 +1,70 @@
+"""
+公共工具模块
+各模块共用的 HTTP 会话、JSON 序列化、目录创建等辅助函数
+"""
+import json
+import re
+from datetime import date
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """序列化为 UTF-8 编码的 JSON 字节串（优先使用 orjson）"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+# 分析结果中的日期格式 YYYY-MM-DD（与 strptime("%Y-%m-%d") 一致，月、日可为一位数，仅限 ASCII 数字）
+_DATE_RE = re.compile(r"([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})")
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """解析 YYYY-MM-DD 日期字符串，非字符串、格式不符或日期不存在时返回 None"""
+    if not isinstance(value, str):
+        return None
+    m = _DATE_RE.fullmatch(value)
+    if not m:
+        return None
+    try:
+        return date(*map(int, m.groups()))
+    except ValueError:
+        return None
+
+
+# 共享 HTTP 会话：首次请求时创建，复用 keep-alive 连接避免重复 TLS 握手
+_SESSION = None
+
+
+def get_session():
+    """获取共享的 requests.Session（首次调用时才导入 requests）
+
+    默认适配器不做重试；需要重试的调用方可用 session.mount 为自己的 URL 前缀挂载专用适配器。
+    """
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0)
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
+# 本进程内已确认存在的目录，避免重复 mkdir
+_CREATED_DIRS = set()
+
+
+def ensure_dir(path: Path) -> None:
+    """确保目录存在（同一目录每个进程只创建一次）"""
+    if path not in _CREATED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _CREATED_DIRS.add(path)
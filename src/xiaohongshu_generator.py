@@ -3,189 +3,32 @@
 生成适合小红书分享的 3:4 比例封面
 """
 import os
-from typing import Dict, Any, Optional
+import re
+import base64
+from functools import lru_cache
+from string import Template
+from typing import Dict, Any, List, Optional
 from pathlib import Path
-from datetime import datetime
 
-from src.config import OUTPUT_DIR
+from src.config import OUTPUT_DIR, XHS_FONT_DIR
+from src.utils import ensure_dir, parse_date
 
 
-class XiaohongshuGenerator:
-    """小红书封面生成器"""
-
-    # 账号信息
-    ACCOUNT_NAME = "极客杰尼"
-    ACCOUNT_SLOGAN = "AI实战派"
-
-    # 尺寸配置
-    COVER_WIDTH = 750
-    COVER_HEIGHT = 1000  # 3:4 比例
-
-    def __init__(self, output_dir: str = None):
-        """
-        初始化生成器
-
-        Args:
-            output_dir: 输出目录
-        """
-        self.output_dir = Path(output_dir or OUTPUT_DIR) / "xiaohongshu"
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-
-    def generate(self, analysis_result: Dict[str, Any]) -> str:
-        """
-        生成小红书风格封面 HTML
-
-        Args:
-            analysis_result: Claude 分析结果
-
-        Returns:
-            生成的 HTML 文件路径
-        """
-        date = analysis_result.get("date", "")
-        summary = analysis_result.get("summary", [])
-        keywords = analysis_result.get("keywords", [])
-
-        # 格式化日期
-        try:
-            dt = datetime.strptime(date, "%Y-%m-%d")
-            formatted_date = f"{dt.month}.{dt.day}"
-        except:
-            formatted_date = date
-
-        # 提取关键信息
-        main_title = self._extract_main_title(summary)
-        subtitle = self._extract_subtitle(summary)
-        highlights = summary[:3] if summary else []
-
-        # 生成 HTML
-        html_content = self._build_html(
-            date=formatted_date,
-            main_title=main_title,
-            subtitle=subtitle,
-            highlights=highlights,
-            keywords=keywords
-        )
-
-        # 保存文件
-        filename = f"xhs-{date}.html"
-        filepath = self.output_dir / filename
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-
-        return str(filepath)
-
-    def _extract_main_title(self, summary: list) -> str:
-        """
-        从摘要中提取主标题（2-3个关键词）
-
-        Args:
-            summary: 摘要列表
-
-        Returns:
-            主标题
-        """
-        if not summary:
-            return "AI日报"
-
-        # 取前两条摘要，提取关键词
-        text = " ".join(summary[:2])
-
-        # 常见的高价值关键词
-        priority_keywords = [
-            "Claude", "GPT", "OpenAI", "Anthropic", "Google",
-            "发布", "开源", "更新", "突破", "首个", "首次",
-            "Agent", "模型", "AI", "大模型", "多模态"
-        ]
-
-        # 提取优先关键词
-        found_keywords = []
-        for keyword in priority_keywords:
-            if keyword in text:
-                found_keywords.append(keyword)
-                if len(found_keywords) >= 3:
-                    break
-
-        if found_keywords:
-            return " · ".join(found_keywords[:2])
-
-        # 如果没有找到关键词，使用第一条摘要的前两个字
-        first = summary[0]
-        if len(first) >= 4:
-            return first[:4]
-
-        return "AI日报"
-
-    def _extract_subtitle(self, summary: list) -> str:
-        """
-        提取副标题
-
-        Args:
-            summary: 摘要列表
-
-        Returns:
-            副标题
-        """
-        if not summary:
-            return f"{self.ACCOUNT_SLOGAN}每日更新"
-
-        # 使用第一条摘要作为副标题，截取合适长度
-        first = summary[0]
-        if len(first) > 25:
-            return first[:25] + "..."
-        return first
-
-    def _build_html(
-        self,
-        date: str,
-        main_title: str,
-        subtitle: str,
-        highlights: list,
-        keywords: list
-    ) -> str:
-        """
-        构建 HTML 内容
-
-        Args:
-            date: 日期
-            main_title: 主标题
-            subtitle: 副标题
-            highlights: 亮点列表
-            keywords: 关键词列表
-
-        Returns:
-            HTML 字符串
-        """
-        # 高亮关键词
-        highlight_spans = ""
-        for i, item in enumerate(highlights[:3]):
-            # 提取关键词（取前6个字）
-            key_text = item[:6] if len(item) > 6 else item
-            highlight_spans += f'<span class="highlight-item">{key_text}</span>'
-
-        # 关键词标签
-        keyword_tags = ""
-        for kw in keywords[:5]:
-            keyword_tags += f'<span class="keyword-tag">#{kw}</span>'
-
-        html = f'''<!DOCTYPE html>
+# 封面 HTML 模板：${...} 为占位符，CSS 花括号无需转义
+_COVER_HTML = '''<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>AI Daily - 小红书封面</title>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Noto+Sans+SC:wght@300;400;500;700;900&family=JetBrains+Mono:wght@400;700&display=swap" rel="stylesheet">
-    <script src="https://cdn.jsdelivr.net/npm/html2canvas@1.4.1/dist/html2canvas.min.js"></script>
-    <style>
-        * {{
+${font_css}${save_lib}    <style>
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
 
-        body {{
+        body {
             font-family: 'Noto Sans SC', sans-serif;
             background: #1a1a1a;
             min-height: 100vh;
@@ -193,26 +36,26 @@ class XiaohongshuGenerator:
             justify-content: center;
             align-items: center;
             padding: 20px;
-        }}
+        }
 
-        .container {{
+        .container {
             display: flex;
             flex-direction: column;
             align-items: center;
             gap: 20px;
-        }}
+        }
 
         /* 封面画布 - 3:4 比例 */
-        .cover-canvas {{
-            width: {self.COVER_WIDTH}px;
-            height: {self.COVER_HEIGHT}px;
+        .cover-canvas {
+            width: ${cover_width}px;
+            height: ${cover_height}px;
             background: #000000;
             position: relative;
             overflow: hidden;
-        }}
+        }
 
         /* 网格背景线 */
-        .grid-lines {{
+        .grid-lines {
             position: absolute;
             top: 0;
             left: 0;
@@ -223,95 +66,95 @@ class XiaohongshuGenerator:
                 linear-gradient(90deg, rgba(255,255,255,0.03) 1px, transparent 1px);
             background-size: 50px 50px;
             pointer-events: none;
-        }}
+        }
 
         /* 装饰性几何元素 */
-        .geo-circle {{
+        .geo-circle {
             position: absolute;
             border: 1px solid rgba(255,255,255,0.1);
             border-radius: 50%;
-        }}
+        }
 
-        .geo-circle-1 {{
+        .geo-circle-1 {
             width: 300px;
             height: 300px;
             top: -100px;
             right: -100px;
-        }}
+        }
 
-        .geo-circle-2 {{
+        .geo-circle-2 {
             width: 200px;
             height: 200px;
             bottom: 100px;
             left: -50px;
             border-color: rgba(0, 255, 136, 0.1);
-        }}
+        }
 
-        .geo-square {{
+        .geo-square {
             position: absolute;
             border: 1px solid rgba(255,255,255,0.05);
-        }}
+        }
 
-        .geo-square-1 {{
+        .geo-square-1 {
             width: 80px;
             height: 80px;
             top: 150px;
             left: 30px;
-        }}
+        }
 
         /* 内容区域 */
-        .content {{
+        .content {
             position: relative;
             z-index: 10;
             height: 100%;
             display: flex;
             flex-direction: column;
             padding: 50px 40px;
-        }}
+        }
 
         /* 顶部信息 */
-        .top-info {{
+        .top-info {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 60px;
-        }}
+        }
 
-        .brand {{
+        .brand {
             display: flex;
             align-items: center;
             gap: 12px;
-        }}
+        }
 
-        .brand-dot {{
+        .brand-dot {
             width: 8px;
             height: 8px;
             background: #00ff88;
-        }}
+        }
 
-        .brand-name {{
+        .brand-name {
             font-size: 14px;
             font-weight: 300;
             color: rgba(255,255,255,0.6);
             letter-spacing: 2px;
-        }}
+        }
 
-        .date-badge {{
+        .date-badge {
             font-family: 'JetBrains Mono', monospace;
             font-size: 14px;
             color: rgba(255,255,255,0.4);
             font-weight: 400;
-        }}
+        }
 
         /* 主标题区域 */
-        .title-section {{
+        .title-section {
             flex: 1;
             display: flex;
             flex-direction: column;
             justify-content: center;
-        }}
+        }
 
-        .main-title {{
+        .main-title {
             font-size: 72px;
             font-weight: 900;
             color: #ffffff;
@@ -319,96 +162,96 @@ class XiaohongshuGenerator:
             letter-spacing: -2px;
             margin-bottom: 30px;
             word-break: keep-all;
-        }}
+        }
 
-        .main-title .highlight {{
+        .main-title .highlight {
             color: #00ff88;
             text-shadow: 0 0 30px rgba(0, 255, 136, 0.5);
-        }}
+        }
 
         /* 分割线 */
-        .divider {{
+        .divider {
             width: 60px;
             height: 3px;
             background: #00ff88;
             margin: 30px 0;
-        }}
+        }
 
         /* 副标题 */
-        .subtitle {{
+        .subtitle {
             font-size: 24px;
             font-weight: 300;
             color: rgba(255,255,255,0.7);
             line-height: 1.5;
             margin-bottom: 40px;
             max-width: 80%;
-        }}
+        }
 
         /* 亮点标签区域 */
-        .highlights {{
+        .highlights {
             display: flex;
             flex-wrap: wrap;
             gap: 12px;
             margin-bottom: 40px;
-        }}
+        }
 
-        .highlight-item {{
+        .highlight-item {
             font-size: 16px;
             color: rgba(255,255,255,0.5);
             padding: 8px 16px;
             border: 1px solid rgba(255,255,255,0.1);
             font-weight: 300;
-        }}
+        }
 
         /* 底部区域 */
-        .bottom-section {{
+        .bottom-section {
             display: flex;
             justify-content: space-between;
             align-items: flex-end;
-        }}
+        }
 
-        .keywords {{
+        .keywords {
             display: flex;
             flex-wrap: wrap;
             gap: 10px;
             max-width: 70%;
-        }}
+        }
 
-        .keyword-tag {{
+        .keyword-tag {
             font-size: 13px;
             color: #00ff88;
             font-weight: 400;
-        }}
+        }
 
-        .account-info {{
+        .account-info {
             text-align: right;
-        }}
+        }
 
-        .account-name {{
+        .account-name {
             font-size: 14px;
             color: rgba(255,255,255,0.4);
             font-weight: 300;
             letter-spacing: 1px;
-        }}
+        }
 
-        .account-slogan {{
+        .account-slogan {
             font-size: 12px;
             color: #00ff88;
             margin-top: 4px;
             font-weight: 400;
-        }}
+        }
 
         /* 装饰性指示线 */
-        .indicator-line {{
+        .indicator-line {
             position: absolute;
             bottom: 50px;
             left: 40px;
             width: 100px;
             height: 1px;
             background: linear-gradient(90deg, rgba(255,255,255,0.3), transparent);
-        }}
+        }
 
-        .indicator-line::after {{
+        .indicator-line::after {
             content: '';
             position: absolute;
             right: 0;
@@ -417,16 +260,16 @@ class XiaohongshuGenerator:
             height: 7px;
             background: #00ff88;
             border-radius: 50%;
-        }}
+        }
 
         /* 控制面板 */
-        .controls {{
+        .controls {
             display: flex;
             gap: 15px;
             align-items: center;
-        }}
+        }
 
-        .btn {{
+        .btn {
             padding: 12px 30px;
             background: rgba(255,255,255,0.1);
             border: 1px solid rgba(255,255,255,0.2);
@@ -436,30 +279,30 @@ class XiaohongshuGenerator:
             transition: all 0.3s;
             font-family: 'Noto Sans SC', sans-serif;
             border-radius: 4px;
-        }}
+        }
 
-        .btn:hover {{
+        .btn:hover {
             background: rgba(255,255,255,0.15);
             border-color: rgba(255,255,255,0.3);
-        }}
+        }
 
-        .btn-primary {{
+        .btn-primary {
             background: #00ff88;
             color: #000;
             border: none;
             font-weight: 500;
-        }}
+        }
 
-        .btn-primary:hover {{
+        .btn-primary:hover {
             background: #00cc6a;
-        }}
+        }
 
-        .status {{
+        .status {
             color: rgba(255,255,255,0.5);
             font-size: 13px;
             min-width: 150px;
             text-align: center;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -479,31 +322,31 @@ class XiaohongshuGenerator:
                 <div class="top-info">
                     <div class="brand">
                         <span class="brand-dot"></span>
-                        <span class="brand-name">{self.ACCOUNT_NAME.upper()}</span>
+                        <span class="brand-name">${account_name_upper}</span>
                     </div>
-                    <div class="date-badge">{date}</div>
+                    <div class="date-badge">${date}</div>
                 </div>
 
                 <!-- 主标题区域 -->
                 <div class="title-section">
-                    <div class="main-title">{main_title}</div>
+                    <div class="main-title">${main_title}</div>
                     <div class="divider"></div>
-                    <div class="subtitle">{subtitle}</div>
+                    <div class="subtitle">${subtitle}</div>
 
                     <!-- 亮点 -->
                     <div class="highlights">
-                        {highlight_spans}
+                        ${highlight_spans}
                     </div>
                 </div>
 
                 <!-- 底部区域 -->
                 <div class="bottom-section">
                     <div class="keywords">
-                        {keyword_tags}
+                        ${keyword_tags}
                     </div>
                     <div class="account-info">
-                        <div class="account-name">{self.ACCOUNT_NAME}</div>
-                        <div class="account-slogan">{self.ACCOUNT_SLOGAN}</div>
+                        <div class="account-name">${account_name}</div>
+                        <div class="account-slogan">${account_slogan}</div>
                     </div>
                 </div>
 
@@ -511,44 +354,462 @@ class XiaohongshuGenerator:
                 <div class="indicator-line"></div>
             </div>
         </div>
+${save_controls}    </div>
+${save_script}</body>
+</html>'''
+
+
+def _minify_css(css: str) -> str:
+    """去掉注释并压缩空白（仅用于模板中的静态样式）"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def _minify_style_block(html: str) -> str:
+    """压缩 HTML 中 <style> 块的内容"""
+    head, rest = html.split("<style>", 1)
+    css, tail = rest.split("</style>", 1)
+    return f"{head}<style>{_minify_css(css)}</style>{tail}"
+
+
+# 模板中的静态样式在导入时压缩一次
+_COVER_HTML = _minify_style_block(_COVER_HTML)
 
+# 浏览器端“保存封面”所需的片段：服务端截图渲染时不需要
+_SAVE_LIB = '''    <script defer src="https://cdn.jsdelivr.net/npm/html2canvas@1.4.1/dist/html2canvas.min.js"></script>
+'''
+
+_SAVE_CONTROLS = '''
         <!-- 控制面板 -->
         <div class="controls">
             <button class="btn btn-primary" onclick="saveImage()">保存封面</button>
             <div class="status" id="status">点击保存按钮下载封面</div>
         </div>
-    </div>
+'''
 
+_SAVE_SCRIPT = '''
     <script>
-        async function saveImage() {{
+        async function saveImage() {
             const cover = document.getElementById('cover');
             const status = document.getElementById('status');
 
             status.textContent = '生成中...';
 
-            try {{
-                const canvas = await html2canvas(cover, {{
-                    scale: 2,
+            try {
+                // 字体就绪后再截图，避免 html2canvas 按回退字体测量文字
+                await document.fonts.ready;
+
+                const canvas = await html2canvas(cover, {
+                    scale: ${save_scale},
                     useCORS: true,
                     backgroundColor: '#000000',
                     logging: false
-                }});
+                });
 
+                // toBlob 异步编码，省去 data URL 的 base64 长字符串
+                const blob = await new Promise(resolve => canvas.toBlob(resolve, ${save_type}));
                 const link = document.createElement('a');
-                link.download = 'ai-daily-xhs-{date}.png';
-                link.href = canvas.toDataURL('image/png');
+                link.download = 'ai-daily-xhs-${date}.${save_ext}';
+                link.href = URL.createObjectURL(blob);
                 link.click();
+                setTimeout(() => URL.revokeObjectURL(link.href), 1000);
 
                 status.textContent = '✓ 封面已保存';
-            }} catch (error) {{
+            } catch (error) {
                 console.error(error);
                 status.textContent = '保存失败，请重试';
-            }}
-        }}
+            }
+        }
     </script>
-</body>
-</html>'''
-        return html
+'''
+
+# 默认从 Google Fonts 加载字体
+_GOOGLE_FONTS = '''    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Noto+Sans+SC:wght@300;400;500;700;900&family=JetBrains+Mono:wght@400;700&display=swap" rel="stylesheet">
+'''
+
+# 本地字体文件名 -> font-family，文件命名为 {名称}-{字重}.woff2
+_FONT_FAMILIES = {
+    "NotoSansSC": "Noto Sans SC",
+    "JetBrainsMono": "JetBrains Mono",
+}
+_FONT_FILE_RE = re.compile(r"([A-Za-z]+)-(\d{3})\.woff2")
+
+
+@lru_cache(maxsize=4)
+def _embedded_font_css(font_dir: str) -> str:
+    """
+    将本地子集字体以 data URI 内嵌为 @font-face，渲染时无需访问网络
+
+    Args:
+        font_dir: 字体目录
+
+    Returns:
+        <style> 片段；目录不存在或没有可用字体时返回空字符串
+    """
+    try:
+        names = sorted(os.listdir(font_dir))
+    except OSError:
+        return ""
+
+    rules = []
+    for name in names:
+        m = _FONT_FILE_RE.fullmatch(name)
+        if not m or m.group(1) not in _FONT_FAMILIES:
+            continue
+        data = base64.b64encode((Path(font_dir) / name).read_bytes()).decode("ascii")
+        rules.append(
+            f"        @font-face {{ font-family: '{_FONT_FAMILIES[m.group(1)]}'; "
+            f"font-weight: {m.group(2)}; font-display: block; "
+            f"src: url(data:font/woff2;base64,{data}) format('woff2'); }}\n"
+        )
+
+    if not rules:
+        return ""
+    return "    <style>\n" + "".join(rules) + "    </style>\n"
+
+
+# HTML 特殊字符转义表（str.translate 单次遍历完成全部替换）
+_HTML_ESCAPE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
+
+def _escape(text: Any) -> str:
+    """转义插入 HTML 的动态文本"""
+    return str(text).translate(_HTML_ESCAPE)
+
+
+# 浏览器端保存格式：(html2canvas 缩放倍数, toBlob 类型参数, 文件扩展名)
+# JPEG 编码更快，1 倍缩放的像素量仅为 2 倍的四分之一；需要高清无损图时再用 PNG
+_SAVE_FORMATS = {
+    "jpeg": ("1", "'image/jpeg', 0.92", "jpg"),
+    "png": ("2", "'image/png'", "png"),
+}
+
+
+@lru_cache(maxsize=8)
+def _cover_template(
+    width: int,
+    height: int,
+    account_name: str,
+    account_name_upper: str,
+    account_slogan: str,
+    include_saver: bool = True,
+    image_format: str = "jpeg",
+    font_css: str = ""
+) -> Template:
+    """
+    预先填充封面模板中的静态部分（尺寸、账号信息、保存按钮）
+
+    Args:
+        include_saver: 是否保留浏览器端 html2canvas 保存按钮
+        image_format: 浏览器端保存格式（jpeg / png）
+        font_css: 内嵌字体样式，为空时使用 Google Fonts
+
+    Returns:
+        只剩日期、标题等动态占位符的模板
+    """
+    static = {
+        "cover_width": width,
+        "cover_height": height,
+        "account_name": account_name,
+        "account_name_upper": account_name_upper,
+        "account_slogan": account_slogan,
+    }
+    # 填入的文本会再次作为模板解析，其中的 $ 需转义
+    static = {k: str(v).replace("$", "$$") for k, v in static.items()}
+    static["font_css"] = font_css or _GOOGLE_FONTS
+    # 保存片段本身含 ${date} 占位符，原样填入，留待第二次替换
+    static["save_lib"] = _SAVE_LIB if include_saver else ""
+    static["save_controls"] = _SAVE_CONTROLS if include_saver else ""
+    if include_saver:
+        scale, data_url_args, ext = _SAVE_FORMATS[image_format]
+        static["save_script"] = Template(_SAVE_SCRIPT).safe_substitute(
+            save_scale=scale, save_type=data_url_args, save_ext=ext
+        )
+    else:
+        static["save_script"] = ""
+    return Template(Template(_COVER_HTML).safe_substitute(static))
+
+
+class XiaohongshuGenerator:
+    """小红书封面生成器"""
+
+    # 账号信息
+    ACCOUNT_NAME = "极客杰尼"
+    ACCOUNT_NAME_UPPER = ACCOUNT_NAME.upper()  # 顶部品牌位显示用
+    ACCOUNT_SLOGAN = "AI实战派"
+
+    # 主标题候选的高价值关键词（按优先级排列）
+    PRIORITY_KEYWORDS = (
+        "Claude", "GPT", "OpenAI", "Anthropic", "Google",
+        "发布", "开源", "更新", "突破", "首个", "首次",
+        "Agent", "模型", "AI", "大模型", "多模态"
+    )
+
+    # 尺寸配置
+    COVER_WIDTH = 750
+    COVER_HEIGHT = 1000  # 3:4 比例
+
+    def __init__(self, output_dir: str = None, image_format: str = "jpeg", font_dir: str = None):
+        """
+        初始化生成器
+
+        Args:
+            output_dir: 输出目录
+            image_format: 页面“保存封面”按钮导出的格式，jpeg（1 倍，较快）或 png（2 倍高清）
+            font_dir: 本地子集字体目录，默认读取 XHS_FONT_DIR；为空时使用 Google Fonts
+        """
+        if image_format not in _SAVE_FORMATS:
+            raise ValueError(f"不支持的图片格式: {image_format}，可选 jpeg / png")
+        self.image_format = image_format
+        font_dir = font_dir or XHS_FONT_DIR
+        self.font_css = _embedded_font_css(font_dir) if font_dir else ""
+        self.output_dir = Path(output_dir or OUTPUT_DIR) / "xiaohongshu"
+        ensure_dir(self.output_dir)
+
+    def generate(self, analysis_result: Dict[str, Any], include_saver: bool = True) -> str:
+        """
+        生成小红书风格封面 HTML
+
+        Args:
+            analysis_result: Claude 分析结果
+            include_saver: 是否包含浏览器端“保存封面”按钮及 html2canvas 脚本，
+                交给无头浏览器截图时可关闭
+
+        Returns:
+            生成的 HTML 文件路径
+        """
+        date = analysis_result.get("date", "")
+        html_content = self._render_html(analysis_result, include_saver)
+
+        # 保存文件
+        filename = f"xhs-{date}.html"
+        filepath = self.output_dir / filename
+        filepath.write_text(html_content, encoding='utf-8')
+
+        return str(filepath)
+
+    def render_png(self, analysis_result: Dict[str, Any]) -> str:
+        """
+        使用无头浏览器直接渲染封面 PNG（需要安装 playwright）
+
+        Args:
+            analysis_result: Claude 分析结果
+
+        Returns:
+            生成的 PNG 文件路径
+        """
+        # 延迟导入：仅渲染 PNG 时才需要事件循环
+        import asyncio
+
+        return asyncio.run(self.render_png_batch([analysis_result]))[0]
+
+    async def render_png_batch(
+        self,
+        results: List[Dict[str, Any]],
+        output_dir: str = None
+    ) -> List[str]:
+        """
+        批量渲染封面 PNG，所有封面共用同一个浏览器实例
+
+        Args:
+            results: 分析结果列表
+            output_dir: PNG 保存目录，默认与 HTML 相同
+
+        Returns:
+            生成的 PNG 文件路径列表
+        """
+        try:
+            from playwright.async_api import async_playwright
+        except ImportError as e:
+            raise ImportError(
+                "渲染 PNG 需要安装 playwright：pip install playwright && playwright install chromium"
+            ) from e
+
+        out_dir = Path(output_dir) if output_dir else self.output_dir
+        ensure_dir(out_dir)
+
+        paths = []
+        async with async_playwright() as pw:
+            browser = await pw.chromium.launch()
+            try:
+                # body 四周各有 20px 内边距
+                context = await browser.new_context(
+                    viewport={"width": self.COVER_WIDTH + 40, "height": self.COVER_HEIGHT + 40}
+                )
+                page = await context.new_page()
+                for result in results:
+                    html_content = self._render_html(result, include_saver=False)
+                    # 字体已内嵌时无需等待网络空闲
+                    await page.set_content(
+                        html_content, wait_until="load" if self.font_css else "networkidle"
+                    )
+                    await page.evaluate("document.fonts.ready")
+
+                    filepath = out_dir / f"xhs-{result.get('date', '')}.png"
+                    await page.locator("#cover").screenshot(path=str(filepath), type="png")
+                    paths.append(str(filepath))
+            finally:
+                await browser.close()
+
+        return paths
+
+    def _render_html(self, analysis_result: Dict[str, Any], include_saver: bool = True) -> str:
+        """
+        根据分析结果生成封面 HTML 字符串
+
+        Args:
+            analysis_result: Claude 分析结果
+            include_saver: 是否保留浏览器端保存按钮
+
+        Returns:
+            HTML 字符串
+        """
+        date = analysis_result.get("date", "")
+        summary = analysis_result.get("summary", [])
+        keywords = analysis_result.get("keywords", [])
+
+        # 格式化日期（正则拆分，无需 strptime；日期缺失或不合法时保持原值）
+        parsed = parse_date(date)
+        formatted_date = f"{parsed.month}.{parsed.day}" if parsed else date
+
+        # 提取关键信息
+        main_title = self._extract_main_title(summary)
+        subtitle = self._extract_subtitle(summary)
+        highlights = summary[:3] if summary else []
+
+        # 生成 HTML
+        return self._build_html(
+            date=formatted_date,
+            main_title=main_title,
+            subtitle=subtitle,
+            highlights=highlights,
+            keywords=keywords,
+            include_saver=include_saver
+        )
+
+    def _extract_main_title(self, summary: list) -> str:
+        """
+        从摘要中提取主标题（2-3个关键词）
+
+        Args:
+            summary: 摘要列表
+
+        Returns:
+            主标题
+        """
+        if not summary:
+            return "AI日报"
+
+        # 只有一条且不足 2 个字时，任何关键词都不可能命中，也不够截取
+        first = summary[0]
+        if len(summary) == 1 and len(first) < 2:
+            return "AI日报"
+
+        # 取前两条摘要，提取关键词（只有一条时无需拼接）
+        text = first if len(summary) == 1 else " ".join(summary[:2])
+
+        # 按优先级顺序提取关键词
+        found_keywords = []
+        for keyword in self.PRIORITY_KEYWORDS:
+            if keyword in text:
+                found_keywords.append(keyword)
+                if len(found_keywords) >= 3:
+                    break
+
+        if found_keywords:
+            return " · ".join(found_keywords[:2])
+
+        # 如果没有找到关键词，使用第一条摘要的前四个字
+        if len(first) >= 4:
+            return first[:4]
+
+        return "AI日报"
+
+    def _extract_subtitle(self, summary: list) -> str:
+        """
+        提取副标题
+
+        Args:
+            summary: 摘要列表
+
+        Returns:
+            副标题
+        """
+        if not summary:
+            return f"{self.ACCOUNT_SLOGAN}每日更新"
+
+        # 使用第一条摘要作为副标题，截取合适长度
+        first = summary[0]
+        if len(first) > 25:
+            return first[:25] + "..."
+        return first
+
+    def _build_html(
+        self,
+        date: str,
+        main_title: str,
+        subtitle: str,
+        highlights: list,
+        keywords: list,
+        include_saver: bool = True
+    ) -> str:
+        """
+        构建 HTML 内容
+
+        Args:
+            date: 日期
+            main_title: 主标题
+            subtitle: 副标题
+            highlights: 亮点列表
+            keywords: 关键词列表
+            include_saver: 是否保留浏览器端保存按钮
+
+        Returns:
+            HTML 字符串
+        """
+        # 高亮关键词（每条取前6个字，先截取再转义）
+        highlight_spans = "".join(
+            f'<span class="highlight-item">{_escape(item[:6])}</span>' for item in highlights[:3]
+        )
+
+        # 关键词标签
+        keyword_tags = "".join(
+            f'<span class="keyword-tag">#{_escape(kw)}</span>' for kw in keywords[:5]
+        )
+
+        template = _cover_template(
+            self.COVER_WIDTH,
+            self.COVER_HEIGHT,
+            self.ACCOUNT_NAME,
+            self.ACCOUNT_NAME_UPPER,
+            self.ACCOUNT_SLOGAN,
+            include_saver,
+            self.image_format,
+            self.font_css
+        )
+        return template.substitute(
+            date=_escape(date),
+            main_title=_escape(main_title),
+            subtitle=_escape(subtitle),
+            highlight_spans=highlight_spans,
+            keyword_tags=keyword_tags
+        )
+
+
+@lru_cache(maxsize=8)
+def _get_generator(output_dir: Optional[str]) -> XiaohongshuGenerator:
+    """按输出目录复用生成器实例（供便捷函数使用）"""
+    return XiaohongshuGenerator(output_dir)
 
 
 def generate_xiaohongshu_cover(analysis_result: Dict[str, Any], output_dir: str = None) -> str:
@@ -562,5 +823,20 @@ def generate_xiaohongshu_cover(analysis_result: Dict[str, Any], output_dir: str
     Returns:
         生成的 HTML 文件路径
     """
-    generator = XiaohongshuGenerator(output_dir)
-    return generator.generate(analysis_result)
+    return _get_generator(output_dir).generate(analysis_result)
+
+
+def render_xiaohongshu_pngs(results: List[Dict[str, Any]], output_dir: str = None) -> List[str]:
+    """
+    便捷函数：批量渲染小红书封面 PNG（需要安装 playwright）
+
+    Args:
+        results: 分析结果列表
+        output_dir: 输出目录
+
+    Returns:
+        生成的 PNG 文件路径列表
+    """
+    import asyncio
+
+    return asyncio.run(_get_generator(output_dir).render_png_batch(results))